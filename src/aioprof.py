@@ -0,0 +1,89 @@
+import asyncio
+import os
+import time
+from collections.abc import Coroutine
+from typing import Any, Dict, List, Tuple
+
+from src.logging_conf import logger
+
+# Profiling is opt-in via PROFILE=1. When disabled nothing here is installed
+# and the hot path pays zero cost - no wrapper objects, no timing calls.
+PROFILING_ENABLED = os.getenv("PROFILE") == "1"
+
+# Coroutine qualname -> [resume count, accumulated wall time in ns]. cProfile
+# attributes await time to the event loop, so it can't tell whether a slow
+# rag_answer is waiting on embeddings, ES or the LLM; per-resume accounting
+# charges each slice of work to the task function that ran it.
+_stats: Dict[str, List[int]] = {}
+
+
+class TrackedCoro(Coroutine):
+    """Coroutine wrapper that times every resume step of a task.
+
+    Each `send`/`throw` is one event-loop step: the synchronous work a task
+    does between two awaits. Accumulating those slices per `__qualname__`
+    yields a table of where task time actually goes.
+    """
+
+    __slots__ = ("_coro", "_name")
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._name = getattr(coro, "__qualname__", type(coro).__name__)
+
+    def _record(self, start_ns: int) -> None:
+        entry = _stats.get(self._name)
+        if entry is None:
+            entry = _stats[self._name] = [0, 0]
+        entry[0] += 1
+        entry[1] += time.monotonic_ns() - start_ns
+
+    def send(self, value):
+        start = time.monotonic_ns()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._record(start)
+
+    def throw(self, typ, val=None, tb=None):
+        start = time.monotonic_ns()
+        try:
+            return self._coro.throw(typ, val, tb)
+        finally:
+            self._record(start)
+
+    def close(self):
+        return self._coro.close()
+
+    def __await__(self):
+        return self
+
+
+def _task_factory(loop, coro, **kwargs) -> "asyncio.Task[Any]":
+    return asyncio.Task(TrackedCoro(coro), loop=loop, **kwargs)
+
+
+def install() -> None:
+    """Install the profiling task factory on the running event loop.
+
+    Called from the FastAPI lifespan when PROFILE=1; every task spawned
+    afterwards is wrapped in `TrackedCoro`.
+    """
+    asyncio.get_running_loop().set_task_factory(_task_factory)
+    logger.info("aioprof enabled - per-task coroutine timing is active")
+
+
+def snapshot() -> Dict[str, Tuple[int, float]]:
+    """Profiling table as {qualname: (resume count, total milliseconds)}.
+
+    Sorted by accumulated time so the hottest coroutines come first.
+    """
+    return {
+        name: (entry[0], entry[1] / 1e6)
+        for name, entry in sorted(_stats.items(), key=lambda kv: kv[1][1], reverse=True)
+    }
+
+
+def reset() -> None:
+    """Drop all accumulated timings."""
+    _stats.clear()
@@ -1,8 +1,10 @@
+from dataclasses import dataclass
+
 from pydantic_settings import BaseSettings
 
 
-class Settings(BaseSettings):
-    """Application settings."""
+class _EnvSettings(BaseSettings):
+    """Environment-backed settings, used only to load and validate at startup."""
 
     # LLM Provider settings
     PRIMARY_LLM_PROVIDER: str = "openai"
@@ -32,5 +34,29 @@ class Settings(BaseSettings):
         env_file_encoding = "utf-8"
 
 
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """Immutable application settings.
+
+    Validation happens once in `_EnvSettings` at import time; this frozen,
+    slotted mirror keeps hot-path attribute reads a plain slot lookup instead
+    of going through Pydantic's model descriptors on every access.
+    """
+
+    PRIMARY_LLM_PROVIDER: str
+    OPENAI_API_KEY: str
+    DEEPSEEK_API_KEY: str
+    OPENAI_CHAT_MODEL: str
+    DEEPSEEK_CHAT_MODEL: str
+    DEEPSEEK_BASE_URL: str
+    EMBEDDING_MODEL: str
+    EMBEDDING_DIMENSIONS: int
+    ES_URL: str
+    ES_INDEX: str
+    APITALLY_CLIENT_ID: str
+    APITALLY_ENVIRONMENT: str
+    APITALLY_APP_NAME: str
+
+
 # Create a global settings object
-settings = Settings()
+settings = Settings(**_EnvSettings().model_dump())
@@ -0,0 +1,73 @@
+import asyncio
+from typing import List, Optional, Tuple
+
+from langchain_openai import OpenAIEmbeddings
+
+from src.config import settings
+from src.logging_conf import logger
+
+# Shared embeddings client for the query path - constructed once so repeat
+# batches reuse the same httpx pool instead of re-handshaking TLS
+_embeddings = OpenAIEmbeddings(
+    model=settings.EMBEDDING_MODEL, api_key=settings.OPENAI_API_KEY
+)
+
+# How long a batch waits for more questions to join before embedding
+_BATCH_WINDOW = 0.005  # seconds
+
+# Maximum questions embedded in one API call
+_MAX_BATCH = 64
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent embed requests into single API calls.
+
+    Callers await `embed`; a background worker waits a few milliseconds for
+    concurrent requests to pile up, then embeds every pending question in one
+    `aembed_documents` call. A burst of N concurrent /question requests pays
+    one HTTPS round trip instead of N.
+    """
+
+    def __init__(self):
+        self._queue: asyncio.Queue[Tuple[str, asyncio.Future]] = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, question: str) -> List[float]:
+        """Embed a question, sharing the API call with concurrent requests."""
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done():
+            # Started lazily so the worker binds to the running event loop
+            self._worker = loop.create_task(self._run())
+        future: asyncio.Future = loop.create_future()
+        self._queue.put_nowait((question, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+
+            # Let concurrent requests join the batch
+            await asyncio.sleep(_BATCH_WINDOW)
+            while len(batch) < _MAX_BATCH and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            texts = [question for question, _ in batch]
+            try:
+                vectors = await _embeddings.aembed_documents(texts)
+            except Exception as e:
+                logger.error(f"Batched embedding call failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            if len(batch) > 1:
+                logger.info(f"Embedded {len(batch)} questions in one batched call")
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+
+# Shared batcher for the query path
+batcher = EmbeddingBatcher()
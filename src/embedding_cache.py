@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from tempfile import gettempdir
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.logging_conf import logger
+
+# Exact tier: normalized-question hash -> embedding vector. A hit skips the
+# embeddings API round trip entirely.
+_MAX_VECTORS = 1024
+
+# Semantic tier: recent embeddings -> retrieved contexts. A hit (cosine
+# similarity above the threshold, within TTL) also skips the ES search.
+_MAX_CONTEXTS = 256
+_SIMILARITY_THRESHOLD = 0.95
+_CONTEXT_TTL = 300.0  # seconds
+
+_vectors: "OrderedDict[str, np.ndarray]" = OrderedDict()
+_contexts: "OrderedDict[str, Tuple[np.ndarray, List[str], float]]" = OrderedDict()
+
+# Disk-backed semantic tier (SQLite + sqlite-vec) so cache hits survive
+# process restarts. Falls back to memory-only if the extension can't load.
+_DB_PATH = os.getenv(
+    "EMBEDDING_CACHE_DB", str(Path(gettempdir()) / "rag-forge-embedding-cache.db")
+)
+_db: Optional[sqlite3.Connection] = None
+_db_initialized = False
+
+# The connection is shared by the to_thread worker threads; SQLite calls are
+# serialized behind this lock so concurrent lookups and writes can't collide
+_db_lock = threading.Lock()
+
+# es_index is a partition key so each index gets its own vector space -
+# a global k=1 lookup could otherwise return another index's nearest row
+# and shadow a valid same-index entry
+_VEC_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS vec_embeddings USING vec0("
+    f"embedding float[{settings.EMBEDDING_DIMENSIONS}] "
+    "distance_metric=cosine, es_index text partition key)"
+)
+
+
+def _get_db() -> Optional[sqlite3.Connection]:
+    """Open and initialize the persistent cache, or None if unavailable.
+
+    Opens the database, runs DDL and purges expired rows, so first use must
+    happen off the event loop like every other call into this tier.
+    """
+    global _db, _db_initialized
+    if _db_initialized:
+        return _db
+    _db_initialized = True
+
+    try:
+        import sqlite_vec
+
+        conn = sqlite3.connect(_DB_PATH, check_same_thread=False)
+        conn.enable_load_extension(True)
+        sqlite_vec.load(conn)
+        conn.enable_load_extension(False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS contexts("
+            "id INTEGER PRIMARY KEY, es_index TEXT, contexts TEXT, ts INTEGER)"
+        )
+        conn.execute(_VEC_DDL)
+        try:
+            conn.execute("SELECT es_index FROM vec_embeddings LIMIT 1")
+        except sqlite3.OperationalError:
+            # Cache file predates the es_index partition column; rebuild
+            conn.execute("DROP TABLE vec_embeddings")
+            conn.execute("DELETE FROM contexts")
+            conn.execute(_VEC_DDL)
+        # Drop entries that expired while the process was down
+        cutoff = int(time.time() - _CONTEXT_TTL)
+        conn.execute(
+            "DELETE FROM vec_embeddings WHERE rowid IN "
+            "(SELECT id FROM contexts WHERE ts < ?)",
+            (cutoff,),
+        )
+        conn.execute("DELETE FROM contexts WHERE ts < ?", (cutoff,))
+        conn.commit()
+        _db = conn
+    except Exception as e:
+        logger.warning(f"Persistent embedding cache unavailable: {str(e)}")
+        _db = None
+    return _db
+
+
+def _find_contexts_persistent(normalized: np.ndarray) -> Optional[List[str]]:
+    """Nearest-neighbour lookup in the on-disk tier (blocking)."""
+    db = _get_db()
+    if db is None:
+        return None
+
+    try:
+        with _db_lock:
+            row = db.execute(
+                "SELECT rowid, distance FROM vec_embeddings "
+                "WHERE embedding MATCH ? AND k = 1 AND es_index = ?",
+                (normalized.tobytes(), settings.ES_INDEX),
+            ).fetchone()
+            if row is None or row[1] > 1.0 - _SIMILARITY_THRESHOLD:
+                return None
+
+            entry = db.execute(
+                "SELECT contexts, ts FROM contexts WHERE id = ?",
+                (row[0],),
+            ).fetchone()
+        if entry is None or entry[1] < time.time() - _CONTEXT_TTL:
+            return None
+        return json.loads(entry[0])
+    except Exception as e:
+        logger.warning(f"Persistent cache lookup failed: {str(e)}")
+        return None
+
+
+def _put_contexts_persistent(normalized: np.ndarray, contexts: List[str]) -> None:
+    """Store a context entry in the on-disk tier (blocking); non-fatal."""
+    db = _get_db()
+    if db is None:
+        return
+
+    try:
+        with _db_lock:
+            cur = db.execute(
+                "INSERT INTO contexts(es_index, contexts, ts) VALUES (?, ?, ?)",
+                (settings.ES_INDEX, json.dumps(contexts), int(time.time())),
+            )
+            db.execute(
+                "INSERT INTO vec_embeddings(rowid, embedding, es_index) "
+                "VALUES (?, ?, ?)",
+                (cur.lastrowid, normalized.tobytes(), settings.ES_INDEX),
+            )
+            db.commit()
+    except Exception as e:
+        logger.warning(f"Persistent cache write failed: {str(e)}")
+
+
+def _question_key(question: str) -> str:
+    """Hash key for the exact tier, insensitive to case and edge whitespace."""
+    return hashlib.sha1(question.strip().lower().encode("utf-8")).hexdigest()
+
+
+def _normalize(vector) -> np.ndarray:
+    arr = np.asarray(vector, dtype=np.float32)
+    return arr / (np.linalg.norm(arr) + 1e-12)
+
+
+def get_vector(question: str) -> Optional[List[float]]:
+    """Return the cached embedding for an exact (normalized) question match."""
+    key = _question_key(question)
+    vec = _vectors.get(key)
+    if vec is None:
+        return None
+    _vectors.move_to_end(key)
+    return vec.tolist()
+
+
+def put_vector(question: str, vector: List[float]) -> None:
+    """Cache a question's embedding, evicting the least recently used."""
+    _vectors[_question_key(question)] = np.asarray(vector, dtype=np.float32)
+    while len(_vectors) > _MAX_VECTORS:
+        _vectors.popitem(last=False)
+
+
+async def find_contexts(vector: List[float]) -> Optional[List[str]]:
+    """Return cached contexts for a semantically similar recent question.
+
+    Compares the query embedding against all cached embeddings in a single
+    matrix-vector product rather than a Python loop. The disk-tier fallback
+    runs in a worker thread so its SQLite I/O never blocks the event loop.
+    """
+    _expire_contexts()
+    normalized = _normalize(vector)
+
+    if _contexts:
+        entries = list(_contexts.values())
+        matrix = np.stack([entry[0] for entry in entries])
+        sims = matrix @ normalized
+
+        best = int(np.argmax(sims))
+        if sims[best] >= _SIMILARITY_THRESHOLD:
+            return entries[best][1]
+
+    # Fall through to the disk tier so warm entries survive restarts
+    contexts = await asyncio.to_thread(_find_contexts_persistent, normalized)
+    if contexts is not None:
+        key = hashlib.sha1(normalized.tobytes()).hexdigest()
+        _contexts[key] = (normalized, contexts, time.monotonic())
+    return contexts
+
+
+async def put_contexts(vector: List[float], contexts: List[str]) -> None:
+    """Cache the contexts retrieved for a question embedding.
+
+    The disk-tier write (including its commit/fsync) happens in a worker
+    thread, off the event loop.
+    """
+    normalized = _normalize(vector)
+    key = hashlib.sha1(normalized.tobytes()).hexdigest()
+    _contexts[key] = (normalized, contexts, time.monotonic())
+    while len(_contexts) > _MAX_CONTEXTS:
+        _contexts.popitem(last=False)
+
+    await asyncio.to_thread(_put_contexts_persistent, normalized, contexts)
+
+
+def clear() -> None:
+    """Drop all cached embeddings and contexts, including the disk tier."""
+    _vectors.clear()
+    _contexts.clear()
+
+    db = _get_db()
+    if db is None:
+        return
+    try:
+        with _db_lock:
+            db.execute("DELETE FROM vec_embeddings")
+            db.execute("DELETE FROM contexts")
+            db.commit()
+    except Exception as e:
+        logger.warning(f"Persistent cache clear failed: {str(e)}")
+
+
+def _expire_contexts() -> None:
+    """Evict semantic-tier entries older than the TTL."""
+    cutoff = time.monotonic() - _CONTEXT_TTL
+    expired = [key for key, entry in _contexts.items() if entry[2] < cutoff]
+    for key in expired:
+        del _contexts[key]
@@ -1,58 +1,133 @@
-import asyncio
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
-from elasticsearch import AsyncElasticsearch
+import orjson
+from elasticsearch import AsyncElasticsearch, BadRequestError
+from elasticsearch.serializer import JsonSerializer
 from zoneinfo import ZoneInfo
 
 from src.config import settings
 from src.logging_conf import logger
 
 
+class OrjsonSerializer(JsonSerializer):
+    """JSON serializer backed by orjson.
+
+    Bulk payloads are dominated by per-chunk vectors; orjson encodes those
+    number-heavy bodies several times faster than stdlib json and with less
+    garbage. OPT_SERIALIZE_NUMPY lets quantized vectors stay ndarrays all
+    the way to the wire instead of detouring through Python lists.
+    """
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(
+            data, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+# Resolved once - ZoneInfo lookups are cached but still cost a dict probe
+# and object churn per call
+_SP_TZ = ZoneInfo("America/Sao_Paulo")
+
+
+def _now_iso() -> str:
+    """Current São Paulo time as an ISO-8601 string."""
+    return datetime.now(_SP_TZ).isoformat()
+
+
 class ESClient:
     _instance: Optional[AsyncElasticsearch] = None
-    _lock = asyncio.Lock()
+
+    # Health responses are cached briefly so aggressive liveness probes
+    # mostly return from memory instead of hitting the cluster
+    _health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+    _HEALTH_TTL = 1.0  # seconds
+
+    # Once documents exist the index stays non-empty, so the emptiness check
+    # is cached and invalidated explicitly when an ingest succeeds
+    _empty_cache: Optional[Tuple[float, bool]] = None
+    _EMPTY_TTL = 30.0  # seconds
+
+    @classmethod
+    async def init(cls) -> None:
+        """Create the Elasticsearch client and index at application startup.
+
+        Called once from the FastAPI lifespan so that `get_client` stays a
+        plain attribute read on the hot path.
+        """
+        if cls._instance is None:
+            cls._instance = AsyncElasticsearch(
+                hosts=[settings.ES_URL],
+                request_timeout=30,
+                max_retries=3,
+                # Enough connections that concurrent bulk inserts and kNN
+                # searches don't queue behind pool acquisition
+                connections_per_node=50,
+                http_compress=True,
+                serializer=OrjsonSerializer(),
+            )
+            # Create index if it doesn't exist
+            await cls.create_index()
 
     @classmethod
-    async def get_client(cls) -> AsyncElasticsearch:
-        """Get or create Elasticsearch client instance."""
-        if not cls._instance:
-            async with cls._lock:
-                if not cls._instance:
-                    cls._instance = AsyncElasticsearch(
-                        hosts=[settings.ES_URL], request_timeout=30, max_retries=3
-                    )
-                    # Create index if it doesn't exist
-                    await cls.create_index()
+    def get_client(cls) -> AsyncElasticsearch:
+        """Get the Elasticsearch client instance initialized at startup."""
+        if cls._instance is None:
+            raise RuntimeError(
+                "Elasticsearch client not initialized - call ESClient.init() first"
+            )
         return cls._instance
 
     @classmethod
     async def create_index(cls) -> None:
-        """Create the index with proper mappings if it doesn't exist."""
+        """Create the index with proper mappings if it doesn't exist.
+
+        Creation is attempted unconditionally and "already exists" is
+        swallowed - one round trip instead of an exists+create pair, with no
+        race window between the two calls.
+        """
         try:
-            if not await cls._instance.indices.exists(index=settings.ES_INDEX):
-                await cls._instance.indices.create(
-                    index=settings.ES_INDEX,
-                    body={
-                        "mappings": {
-                            "properties": {
-                                "id": {"type": "keyword"},
-                                "content": {"type": "text"},
-                                "vector": {
-                                    "type": "dense_vector",
-                                    "dims": settings.EMBEDDING_DIMENSIONS,
-                                    "index": True,
-                                    "similarity": "cosine",
-                                },
-                                "source": {"type": "keyword"},
-                            }
-                        }
-                    },
-                )
-                logger.info(
-                    f"Created index {settings.ES_INDEX} with vector search mappings"
-                )
+            await cls._instance.indices.create(
+                index=settings.ES_INDEX,
+                body={
+                    "mappings": {
+                        # The vector stays indexed for kNN but is dropped from
+                        # _source, so search hits don't haul ~3 KB of numbers
+                        # per result that nothing ever reads back
+                        "_source": {"excludes": ["vector"]},
+                        "properties": {
+                            "id": {"type": "keyword"},
+                            "content": {"type": "text"},
+                            "vector": {
+                                "type": "dense_vector",
+                                "dims": settings.EMBEDDING_DIMENSIONS,
+                                "index": True,
+                                # Vectors are unit-normalized before int8
+                                # quantization, so plain dot products rank
+                                # identically to cosine without the
+                                # per-candidate magnitude computation
+                                "similarity": "dot_product",
+                                # int8 vectors: 4x smaller on disk/in memory
+                                # and 4x fewer bytes per bulk insert
+                                "element_type": "byte",
+                            },
+                            "source": {"type": "keyword"},
+                        },
+                    }
+                },
+            )
+            logger.info(
+                f"Created index {settings.ES_INDEX} with vector search mappings"
+            )
+        except BadRequestError as e:
+            if e.error != "resource_already_exists_exception":
+                logger.error(f"Failed to create index: {str(e)}")
+                raise
         except Exception as e:
             logger.error(f"Failed to create index: {str(e)}")
             raise
@@ -68,27 +143,75 @@ class ESClient:
     async def is_index_empty(cls) -> bool:
         """Check if the index is empty or doesn't exist.
 
+        The result is cached for `_EMPTY_TTL` seconds; `/documents` calls
+        `invalidate_empty_cache` after a successful ingest so a fresh upload
+        is visible immediately.
+
         Returns:
             bool: True if index doesn't exist or is empty, False otherwise
         """
+        cached = cls._empty_cache
+        if cached is not None and time.monotonic() - cached[0] < cls._EMPTY_TTL:
+            return cached[1]
+
         try:
-            client = await cls.get_client()
-            # First check if index exists
-            if not await client.indices.exists(index=settings.ES_INDEX):
-                return True
-
-            # Then check document count
-            result = await client.count(index=settings.ES_INDEX)
-            return result["count"] == 0
+            result = await cls._is_index_empty()
         except Exception as e:
             logger.error(f"Error checking if index is empty: {str(e)}")
-            return True  # Assume empty on error for safety
+            # Assume empty on error for safety, but don't cache it - a
+            # transient ES error must not pin "no documents" for the TTL
+            return True
+
+        cls._empty_cache = (time.monotonic(), result)
+        return result
+
+    @classmethod
+    def invalidate_empty_cache(cls) -> None:
+        """Drop the cached emptiness result after documents are written."""
+        cls._empty_cache = None
+
+    @classmethod
+    async def _is_index_empty(cls) -> bool:
+        """Ask Elasticsearch whether the index has any documents.
+
+        Raises on ES errors so the caller can decide whether the answer is
+        cacheable.
+        """
+        client = cls.get_client()
+        # First check if index exists
+        if not await client.indices.exists(index=settings.ES_INDEX):
+            return True
+
+        # We only need "is there at least one doc?" - terminate_after=1
+        # short-circuits instead of counting every segment
+        result = await client.search(
+            index=settings.ES_INDEX,
+            size=0,
+            terminate_after=1,
+            track_total_hits=1,
+        )
+        return result["hits"]["total"]["value"] == 0
 
     @classmethod
     async def check_health(cls) -> Dict[str, Any]:
-        """Check Elasticsearch and index health."""
+        """Check Elasticsearch and index health.
+
+        Results are cached for `_HEALTH_TTL` seconds; cluster status rarely
+        changes second-to-second, so repeat probes skip the ES round trips.
+        """
+        cached = cls._health_cache
+        if cached is not None and time.monotonic() - cached[0] < cls._HEALTH_TTL:
+            return cached[1]
+
+        health = await cls._check_health()
+        cls._health_cache = (time.monotonic(), health)
+        return health
+
+    @classmethod
+    async def _check_health(cls) -> Dict[str, Any]:
+        """Query Elasticsearch for cluster and index health."""
         try:
-            client = await cls.get_client()
+            client = cls.get_client()
 
             # Basic cluster health check
             cluster_health = await client.cluster.health()
@@ -98,9 +221,7 @@ class ESClient:
                 return {
                     "status": "red",
                     "message": f"Index {settings.ES_INDEX} does not exist",
-                    "timestamp": datetime.now(
-                        ZoneInfo("America/Sao_Paulo")
-                    ).isoformat(),
+                    "timestamp": _now_iso(),
                 }
 
             return {
@@ -108,7 +229,7 @@ class ESClient:
                 "message": "Service is healthy"
                 if cluster_health["status"] in ["green", "yellow"]
                 else "Service is degraded",
-                "timestamp": datetime.now(ZoneInfo("America/Sao_Paulo")).isoformat(),
+                "timestamp": _now_iso(),
             }
 
         except Exception as e:
@@ -116,7 +237,7 @@ class ESClient:
             return {
                 "status": "red",
                 "message": "Service is unavailable",
-                "timestamp": datetime.now(ZoneInfo("America/Sao_Paulo")).isoformat(),
+                "timestamp": _now_iso(),
             }
 
 
@@ -124,8 +245,7 @@ class ESClient:
 async def get_es_client():
     """Context manager for getting ES client."""
     try:
-        client = await ESClient.get_client()
-        yield client
+        yield ESClient.get_client()
     except Exception as e:
         logger.error(f"Error with ES client: {str(e)}")
         raise
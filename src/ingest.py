@@ -1,6 +1,7 @@
 import asyncio
+from itertools import islice
 from pathlib import Path
-from typing import List, Tuple
+from typing import List
 from uuid import uuid4
 
 from elasticsearch import NotFoundError
@@ -12,84 +13,133 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 from src.config import settings
 from src.es_client import get_es_client
 from src.logging_conf import logger
-from src.utils import extract_text_from_pdf, normalize_text, run_ocrmypdf
+from src.utils import (
+    cache_text,
+    extract_text_from_pdf,
+    file_sha256,
+    get_cached_text,
+    normalize_text,
+    quantize_vector,
+    run_ocrmypdf,
+)
 
+# Shared embeddings client - reused across documents so the underlying HTTP
+# connection pool (and its TLS handshakes) is paid for once per process.
+_embeddings = OpenAIEmbeddings(
+    model=settings.EMBEDDING_MODEL, api_key=settings.OPENAI_API_KEY
+)
 
-async def process_document(file_path: Path) -> Tuple[int, int]:
-    """Process a document from file to chunks and index them.
+# Maximum number of inputs the OpenAI embeddings endpoint accepts per request
+_EMBED_BATCH_SIZE = 2048
+
+# Splitter parameters never change at runtime, so build it (and its internal
+# separator state) once per process instead of once per document
+_SPLITTER = RecursiveCharacterTextSplitter(chunk_size=3000, chunk_overlap=500)
+
+# Docs per bulk request; with int8 vectors a 500-doc batch stays well under
+# Elasticsearch's recommended bulk payload ceiling
+_BULK_CHUNK_SIZE = 500
+
+# Number of concurrent bulk streams per insert - the async analog of
+# elasticsearch-py's parallel_bulk
+_BULK_CONCURRENCY = 4
+
+
+async def chunk_document(file_path: Path) -> List[Document]:
+    """Extract, normalize and split a document into chunks.
+
+    Embedding and indexing happen separately (see `embed_texts` and
+    `insert_chunks`) so that chunks from concurrently uploaded files can be
+    embedded together in batched API calls.
 
     Args:
         file_path: Path to the PDF file to process
 
     Returns:
-        Tuple[int, int]: (number of documents, number of chunks)
-        Returns (0, 0) if processing fails
+        List[Document]: Document chunks, or an empty list if processing fails
     """
     if not file_path.exists():
         logger.error(f"File not found: {file_path}")
-        return 0, 0
+        return []
 
     logger.info(f"Starting document processing for {file_path.name}")
 
     try:
-        # Extract text with timeout
-        text = await asyncio.wait_for(
-            extract_text_from_pdf(file_path),
-            timeout=30.0,  # 30 seconds for PDF extraction
-        )
-
-        if text is None:
-            logger.info("No text found in PDF, falling back to OCR.")
-            out_txt_path = file_path.with_suffix(".txt")
-            # OCR with timeout
+        # Re-uploads of the same bytes skip extraction (and OCR) entirely
+        content_hash = await file_sha256(file_path)
+        text = await asyncio.to_thread(get_cached_text, content_hash)
+
+        if text is not None:
+            logger.info(f"Extracted-text cache hit for {file_path.name}")
+        else:
+            # Extract text with timeout
             text = await asyncio.wait_for(
-                run_ocrmypdf(file_path, out_txt_path),
-                timeout=120.0,  # 2 minutes for OCR
+                extract_text_from_pdf(file_path),
+                timeout=30.0,  # 30 seconds for PDF extraction
             )
 
+            if text is None:
+                logger.info("No text found in PDF, falling back to OCR.")
+                out_txt_path = file_path.with_suffix(".txt")
+                # OCR with timeout
+                text = await asyncio.wait_for(
+                    run_ocrmypdf(file_path, out_txt_path),
+                    timeout=120.0,  # 2 minutes for OCR
+                )
+
+            if text:
+                await asyncio.to_thread(cache_text, content_hash, text)
+
         if not text:
             logger.error("Failed to extract text from document")
-            return 0, 0
+            return []
 
         normalized_text = normalize_text(text)
 
         doc = Document(
             page_content=normalized_text, metadata={"source": file_path.name}
         )
-        splitter = RecursiveCharacterTextSplitter(chunk_size=3000, chunk_overlap=500)
-        chunks = splitter.split_documents([doc])
+        chunks = _SPLITTER.split_documents([doc])
 
         if not chunks:
             logger.warning("Document was split into 0 chunks")
-            return 0, 0
+            return []
 
         logger.info(f"Document split into chunks. # of chunks: {len(chunks)}")
 
-        embeddings = OpenAIEmbeddings(
-            model=settings.EMBEDDING_MODEL, api_key=settings.OPENAI_API_KEY
-        )
-        texts = [chunk.page_content for chunk in chunks]
-
-        # Generate embeddings with timeout
-        vectors = await asyncio.wait_for(
-            embeddings.aembed_documents(texts),
-            timeout=60.0,  # 1 minute for embeddings
-        )
-
-        # Insert chunks with timeout
-        await asyncio.wait_for(
-            insert_chunks(chunks, vectors),
-            timeout=60.0,  # 1 minute for insertion
-        )
-
-        return 1, len(chunks)
+        return chunks
 
     except asyncio.TimeoutError:
         logger.error(f"Timeout processing document {file_path.name}")
-        return 0, 0
+        return []
     except Exception as e:
         logger.error(f"Error processing {file_path.name}: {str(e)}")
-        return 0, 0
+        return []
+
+
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    """Embed texts in as few API calls as possible.
+
+    The embeddings endpoint accepts up to 2048 inputs per request, so pooling
+    chunk texts across an upload batch turns N per-file round trips into
+    ceil(total_chunks / 2048) calls.
+
+    Args:
+        texts: Chunk texts to embed
+
+    Returns:
+        List[List[float]]: One embedding vector per input text, in order
+    """
+    vectors: List[List[float]] = []
+    for start in range(0, len(texts), _EMBED_BATCH_SIZE):
+        batch = texts[start : start + _EMBED_BATCH_SIZE]
+        vectors.extend(
+            await asyncio.wait_for(
+                _embeddings.aembed_documents(batch),
+                timeout=60.0,  # 1 minute per embedding batch
+            )
+        )
+    return vectors
 
 
 async def insert_chunks(docs: List[Document], vectors: List[List[float]]) -> None:
@@ -110,37 +160,55 @@ async def insert_chunks(docs: List[Document], vectors: List[List[float]]) -> Non
         )
 
     async with get_es_client() as client:
-        actions = [
-            {
-                "_index": settings.ES_INDEX,
-                "_source": {
-                    "id": str(uuid4()),
-                    "content": doc.page_content,
-                    "vector": vec,
-                    **doc.metadata,
-                },
-            }
-            for doc, vec in zip(docs, vectors)
-        ]
+        # Stream actions one at a time so async_bulk can start shipping
+        # batches to ES while later chunks are still being formatted, instead
+        # of materializing the whole (vector-heavy) action list up front.
+        # Each stream takes every _BULK_CONCURRENCY-th chunk so the streams
+        # are balanced without pre-splitting the inputs.
+        async def gen_actions(stream_idx: int):
+            for doc, vec in islice(zip(docs, vectors), stream_idx, None, n_streams):
+                yield {
+                    "_index": settings.ES_INDEX,
+                    "_source": {
+                        "id": uuid4().hex,
+                        "content": doc.page_content,
+                        "vector": quantize_vector(vec),
+                        # Metadata only ever carries the source filename;
+                        # assigning it directly skips a per-chunk dict merge
+                        "source": doc.metadata.get("source"),
+                    },
+                }
+
+        n_streams = min(_BULK_CONCURRENCY, len(docs))
 
         try:
-            result = await async_bulk(
-                client,
-                actions,
-                chunk_size=100,
-                max_retries=3,
-                request_timeout=30,
-                raise_on_error=False,  # Get error details instead of failing fast
+            results = await asyncio.gather(
+                *[
+                    async_bulk(
+                        client,
+                        gen_actions(i),
+                        chunk_size=_BULK_CHUNK_SIZE,
+                        max_retries=3,
+                        request_timeout=30,
+                        raise_on_error=False,  # Get error details instead of failing fast
+                    )
+                    for i in range(n_streams)
+                ]
             )
 
-            success, failed = result
-
-            if isinstance(failed, list):
-                n_failed = len(failed)
-                if failed:
-                    logger.error(f"Failed documents: {failed}")
-            else:
-                n_failed = failed
+            success = 0
+            n_failed = 0
+            failed_items: List = []
+            for stream_success, stream_failed in results:
+                success += stream_success
+                if isinstance(stream_failed, list):
+                    failed_items.extend(stream_failed)
+                else:
+                    n_failed += stream_failed
+
+            if failed_items:
+                logger.error(f"Failed documents: {failed_items}")
+                n_failed += len(failed_items)
 
             logger.info(
                 f"Bulk insert completed: {success} succeeded, {n_failed} failed"
@@ -1,7 +1,14 @@
+from functools import lru_cache
+
 from .base import LLMProvider
 from .fallback import FallbackLLMProvider
 
 
+@lru_cache(maxsize=1)
 def create_llm_provider() -> LLMProvider:
-    """Factory function to create the appropriate LLM provider based on settings."""
+    """Factory function to create the appropriate LLM provider based on settings.
+
+    Cached so every request shares one provider instance - and with it one
+    set of AsyncOpenAI clients and their warm connection pools.
+    """
     return FallbackLLMProvider()
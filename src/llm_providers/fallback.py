@@ -1,3 +1,5 @@
+import time
+
 from src.config import settings
 from src.logging_conf import logger
 
@@ -6,12 +8,21 @@ from .providers import DeepSeekProvider, OpenAIProvider
 
 
 class FallbackLLMProvider(LLMProvider):
+    # Circuit breaker: after this many consecutive primary failures, skip
+    # straight to the fallback for _SKIP_SECONDS so a confirmed outage does
+    # not add the primary's full timeout to every request
+    _FAILURE_THRESHOLD = 3
+    _SKIP_SECONDS = 30.0
+
     def __init__(self):
         self.primary_provider = OpenAIProvider(settings.OPENAI_API_KEY)
         self.fallback_provider = DeepSeekProvider(settings.DEEPSEEK_API_KEY)
         self.primary_name = "OpenAI"
         self.fallback_name = "DeepSeek"
 
+        self._primary_failures = 0
+        self._primary_skip_until = 0.0
+
         # Optionally flip order based on configuration
         if settings.PRIMARY_LLM_PROVIDER == "deepseek":
             self.primary_provider, self.fallback_provider = (
@@ -24,29 +35,50 @@ class FallbackLLMProvider(LLMProvider):
             )
 
     async def generate_completion(self, prompt: str, system_message: str) -> str:
-        try:
-            logger.info(f"Attempting to generate completion with {self.primary_name}")
-            result = await self.primary_provider.generate_completion(
-                prompt, system_message
-            )
-            logger.info(f"Successfully generated completion using {self.primary_name}")
-            return result
-        except Exception as e:
-            logger.warning(
-                f"{self.primary_name} failed with error: {str(e)}. Falling back to {self.fallback_name}."
-            )
+        primary_error = None
+
+        if time.monotonic() >= self._primary_skip_until:
             try:
-                result = await self.fallback_provider.generate_completion(
+                logger.info(
+                    f"Attempting to generate completion with {self.primary_name}"
+                )
+                result = await self.primary_provider.generate_completion(
                     prompt, system_message
                 )
                 logger.info(
-                    f"Successfully generated completion using fallback provider {self.fallback_name}"
+                    f"Successfully generated completion using {self.primary_name}"
                 )
+                self._primary_failures = 0
                 return result
-            except Exception as fallback_error:
-                logger.error(
-                    f"Fallback provider {self.fallback_name} also failed: {str(fallback_error)}"
+            except Exception as e:
+                self._primary_failures += 1
+                if self._primary_failures >= self._FAILURE_THRESHOLD:
+                    self._primary_skip_until = time.monotonic() + self._SKIP_SECONDS
+                    logger.warning(
+                        f"{self.primary_name} failed {self._primary_failures} times in a row. "
+                        f"Skipping it for the next {self._SKIP_SECONDS:.0f}s."
+                    )
+                logger.warning(
+                    f"{self.primary_name} failed with error: {str(e)}. Falling back to {self.fallback_name}."
                 )
-                raise Exception(
-                    f"Both LLM providers failed. Primary error: {str(e)}, Fallback error: {str(fallback_error)}"
-                ) from fallback_error
+                primary_error = e
+        else:
+            logger.info(
+                f"{self.primary_name} circuit is open - going straight to {self.fallback_name}"
+            )
+
+        try:
+            result = await self.fallback_provider.generate_completion(
+                prompt, system_message
+            )
+            logger.info(
+                f"Successfully generated completion using fallback provider {self.fallback_name}"
+            )
+            return result
+        except Exception as fallback_error:
+            logger.error(
+                f"Fallback provider {self.fallback_name} also failed: {str(fallback_error)}"
+            )
+            raise Exception(
+                f"Both LLM providers failed. Primary error: {str(primary_error)}, Fallback error: {str(fallback_error)}"
+            ) from fallback_error
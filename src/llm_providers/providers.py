@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+import httpx
 from openai import AsyncOpenAI
 
 from src.config import settings
@@ -6,9 +9,33 @@ from src.logging_conf import logger
 from .base import LLMProvider
 
 
+def _http_client() -> httpx.AsyncClient:
+    """HTTP client tuned for concurrent completion traffic.
+
+    HTTP/2 multiplexes parallel requests over one TCP+TLS connection, and
+    the enlarged pool keeps bursts of /question calls from queueing behind
+    connection acquisition.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=60.0,
+    )
+
+
+@lru_cache(maxsize=8)
+def _system_dict(system_message: str) -> dict:
+    """Cached system-role message dict.
+
+    The system message comes from a fixed prompt template, so reusing the
+    dict avoids one small allocation per completion on the /question path.
+    """
+    return {"role": "system", "content": system_message}
+
+
 class OpenAIProvider(LLMProvider):
     def __init__(self, api_key: str):
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key, http_client=_http_client())
         self.model = settings.OPENAI_CHAT_MODEL
 
     async def generate_completion(self, prompt: str, system_message: str) -> str:
@@ -16,7 +43,7 @@ class OpenAIProvider(LLMProvider):
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_message},
+                    _system_dict(system_message),
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.0,
@@ -29,7 +56,11 @@ class OpenAIProvider(LLMProvider):
 
 class DeepSeekProvider(LLMProvider):
     def __init__(self, api_key: str):
-        self.client = AsyncOpenAI(api_key=api_key, base_url=settings.DEEPSEEK_BASE_URL)
+        self.client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=settings.DEEPSEEK_BASE_URL,
+            http_client=_http_client(),
+        )
         self.model = settings.DEEPSEEK_CHAT_MODEL
 
     async def generate_completion(self, prompt: str, system_message: str) -> str:
@@ -37,7 +68,7 @@ class DeepSeekProvider(LLMProvider):
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": system_message},
+                    _system_dict(system_message),
                     {"role": "user", "content": prompt},
                 ],
                 temperature=0.0,
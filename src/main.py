@@ -6,9 +6,11 @@ from typing import List, Tuple
 
 import aiofiles
 from fastapi import FastAPI, File, HTTPException, UploadFile
+from langchain_core.documents import Document
 
+from src import aioprof
 from src.es_client import ESClient
-from src.ingest import process_document
+from src.ingest import chunk_document, embed_texts, insert_chunks
 from src.logging_conf import logger
 from src.rag import rag_answer
 from src.schemas import (
@@ -23,7 +25,9 @@ from src.schemas import (
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI application."""
     try:
-        await ESClient.get_client()
+        if aioprof.PROFILING_ENABLED:
+            aioprof.install()
+        await ESClient.init()
         logger.info("Successfully initialized Elasticsearch client")
         yield
     finally:
@@ -230,23 +234,30 @@ async def upload_documents(
             failed_files=failed_files,
         )
 
-    async def process_single_file(file: UploadFile) -> Tuple[int, int]:
+    async def chunk_single_file(file: UploadFile) -> List[Document]:
         try:
             async with aiofiles.tempfile.NamedTemporaryFile(
                 delete=False, suffix=".pdf"
             ) as tmp:
-                content = await file.read()
-                await tmp.write(content)
+                # Stream in 1 MiB chunks so peak memory stays O(chunk size)
+                # instead of buffering the whole PDF in a bytes object
+                while chunk := await file.read(1 << 20):
+                    await tmp.write(chunk)
                 tmp_path = Path(tmp.name)
 
             try:
-                docs, chunks = await process_document(tmp_path)
-                logger.info(f"Successfully processed {file.filename}: {chunks} chunks")
-                return docs, chunks
+                chunks = await chunk_document(tmp_path)
+                if not chunks:
+                    failed_files.append(f"{file.filename} (processing error)")
+                else:
+                    logger.info(
+                        f"Successfully chunked {file.filename}: {len(chunks)} chunks"
+                    )
+                return chunks
             except Exception as e:
                 logger.error(f"Error processing {file.filename}: {str(e)}")
                 failed_files.append(f"{file.filename} (processing error)")
-                return 0, 0
+                return []
             finally:
                 if tmp_path.exists():
                     os.unlink(tmp_path)
@@ -254,15 +265,58 @@ async def upload_documents(
         except Exception as e:
             logger.error(f"Error handling {file.filename}: {str(e)}")
             failed_files.append(f"{file.filename} (upload error)")
+            return []
+
+    async def index_single_file(
+        file: UploadFile, chunks: List[Document], vectors: List[List[float]]
+    ) -> Tuple[int, int]:
+        try:
+            await asyncio.wait_for(
+                insert_chunks(chunks, vectors),
+                timeout=60.0,  # 1 minute for insertion
+            )
+            return 1, len(chunks)
+        except Exception as e:
+            logger.error(f"Error indexing {file.filename}: {str(e)}")
+            failed_files.append(f"{file.filename} (indexing error)")
             return 0, 0
 
-    # Process all valid files concurrently
-    results = await asyncio.gather(*[process_single_file(file) for file in valid_files])
+    # Chunk all valid files concurrently
+    chunked = await asyncio.gather(*[chunk_single_file(file) for file in valid_files])
+
+    # Embed all chunks from the whole upload in batched API calls instead of
+    # one round trip per file
+    all_texts = [chunk.page_content for chunks in chunked for chunk in chunks]
+    try:
+        vectors = await embed_texts(all_texts) if all_texts else []
+    except Exception as e:
+        logger.error(f"Embedding failed for upload batch: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to generate embeddings for the uploaded documents",
+        ) from e
+
+    # Split the vectors back per file and index concurrently
+    inserts = []
+    offset = 0
+    for file, chunks in zip(valid_files, chunked):
+        if not chunks:
+            continue
+        inserts.append(
+            index_single_file(file, chunks, vectors[offset : offset + len(chunks)])
+        )
+        offset += len(chunks)
+
+    results = await asyncio.gather(*inserts)
 
     # Aggregate results
     total_docs = sum(docs for docs, _ in results)
     total_chunks = sum(chunks for _, chunks in results)
 
+    if total_docs > 0:
+        # Newly indexed documents must be visible to /question immediately
+        ESClient.invalidate_empty_cache()
+
     logger.info(
         f"Document upload completed - {total_docs} docs, {total_chunks} chunks. "
         f"Failed files: {len(failed_files)}"
@@ -356,7 +410,11 @@ async def ask_question(request: QuestionRequest):
     logger.info(f"Question received - Length: {len(request.question)}")
 
     try:
-        answer, chunks = await rag_answer(request.question)
+        answer, chunks = await rag_answer(
+            request.question,
+            num_candidates=request.num_candidates,
+            rescore_factor=request.rescore_factor,
+        )
         logger.info(
             f"Question answered successfully - Answer length: {len(answer)}, Chunks used: {len(chunks)}"
         )
@@ -366,7 +424,21 @@ async def ask_question(request: QuestionRequest):
         raise HTTPException(status_code=500, detail=str(e)) from e
 
 
+if aioprof.PROFILING_ENABLED:
+
+    @app.get("/debug/aioprof", include_in_schema=False)
+    async def aioprof_stats():
+        """Per-coroutine resume counts and accumulated milliseconds.
+
+        Only registered when PROFILE=1, so production deployments don't
+        expose (or pay for) the profiler.
+        """
+        return aioprof.snapshot()
+
+
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop ships with uvicorn[standard]; request it explicitly so the
+    # C-level event loop is used even if auto-detection ever changes
+    uvicorn.run("src.main:app", host="0.0.0.0", port=8000, reload=True, loop="uvloop")
@@ -1,17 +1,55 @@
 import asyncio
-from typing import List, Tuple
+import logging
+from statistics import fmean
+from typing import List, Optional, Tuple
 
 from elasticsearch import NotFoundError
-from langchain_openai import OpenAIEmbeddings
 
+from src import embedding_cache
 from src.config import settings
+from src.embedding_batcher import batcher
 from src.es_client import ESClient, get_es_client
 from src.llm_providers.factory import create_llm_provider
 from src.logging_conf import logger
+from src.utils import quantize_vector
 
 
-async def retrieve_context(question: str, top_k: int = 5) -> List[str]:
-    """Retrieve relevant context from Elasticsearch based on the question."""
+async def _question_vector(question: str, no_cache: bool = False) -> List[float]:
+    """Embed the question, using the exact cache when allowed."""
+    vector = None if no_cache else embedding_cache.get_vector(question)
+    if vector is None:
+        vector = await asyncio.wait_for(
+            batcher.embed(question),
+            timeout=10.0,  # 10 second timeout for embeddings
+        )
+        if not no_cache:
+            embedding_cache.put_vector(question, vector)
+    else:
+        logger.info("Embedding cache hit - skipping embeddings API call")
+    return vector
+
+
+async def retrieve_context(
+    question: str,
+    top_k: int = 5,
+    num_candidates: Optional[int] = None,
+    rescore_factor: Optional[float] = None,
+    no_cache: bool = False,
+    vector: Optional[List[float]] = None,
+) -> List[str]:
+    """Retrieve relevant context from Elasticsearch based on the question.
+
+    `num_candidates` controls how many HNSW candidates each shard considers
+    (recall vs. ES CPU); it defaults to max(100, 10 * top_k). On quantized
+    indices, `rescore_factor` additionally oversamples candidates and
+    rescores the top set with full-precision vectors.
+
+    Repeat questions are served from a two-tier cache: exact matches reuse
+    the stored embedding, and embeddings close enough to a recent question
+    reuse its retrieved contexts without hitting Elasticsearch at all. Pass
+    `no_cache=True` to bypass both tiers, or `vector` to reuse an embedding
+    that was already computed.
+    """
     if not question.strip():
         raise ValueError("Question cannot be empty")
 
@@ -21,26 +59,38 @@ async def retrieve_context(question: str, top_k: int = 5) -> List[str]:
     logger.info(f"Embedding model: {settings.EMBEDDING_MODEL}")
 
     try:
-        embeddings = OpenAIEmbeddings(
-            model=settings.EMBEDDING_MODEL, api_key=settings.OPENAI_API_KEY
-        )
-        question_vector = await asyncio.wait_for(
-            embeddings.aembed_query(question),
-            timeout=10.0,  # 10 second timeout for embeddings
-        )
+        question_vector = vector
+        if question_vector is None:
+            question_vector = await _question_vector(question, no_cache)
+
+        if not no_cache:
+            cached_contexts = await embedding_cache.find_contexts(question_vector)
+            if cached_contexts is not None:
+                logger.info("Semantic cache hit - skipping Elasticsearch search")
+                return cached_contexts
+
+        # Quantize to int8 to match the byte dense_vector mapping
+        search_vector = quantize_vector(question_vector)
+
+        knn = {
+            "field": "vector",
+            "query_vector": search_vector,
+            "k": top_k,
+            "num_candidates": num_candidates or max(100, 10 * top_k),
+        }
+        if rescore_factor is not None:
+            knn["rescore_vector"] = {"oversample": rescore_factor}
 
         async with get_es_client() as client:
             try:
                 response = await asyncio.wait_for(
                     client.search(
                         index=settings.ES_INDEX,
-                        knn={
-                            "field": "vector",
-                            "query_vector": question_vector,
-                            "k": top_k,
-                            "num_candidates": top_k * 2,
-                        },
+                        knn=knn,
                         size=top_k,
+                        # Only content is consumed from the hits; skip
+                        # shipping and parsing every other stored field
+                        source_includes=["content"],
                         request_timeout=30,
                     ),
                     timeout=35.0,  # 35 second timeout (slightly longer than ES timeout)
@@ -56,10 +106,16 @@ async def retrieve_context(question: str, top_k: int = 5) -> List[str]:
             logger.warning("No relevant contexts found")
             return []
 
-        avg_length = sum(len(c) for c in contexts) / len(contexts)
-        logger.info(
-            f"Context retrieved successfully - {len(contexts)} contexts, avg length: {avg_length:.0f}"
-        )
+        if not no_cache:
+            await embedding_cache.put_contexts(question_vector, contexts)
+
+        # Only walk the contexts for the stats line if it will actually be
+        # emitted; fmean(map(...)) stays in C when it is
+        if logger.isEnabledFor(logging.INFO):
+            avg_length = fmean(map(len, contexts))
+            logger.info(
+                f"Context retrieved successfully - {len(contexts)} contexts, avg length: {avg_length:.0f}"
+            )
 
         return contexts
 
@@ -79,14 +135,14 @@ async def generate_answer(question: str, contexts: List[str]) -> str:
     logger.info("Generating answer.")
     llm_provider = create_llm_provider()
 
-    prompt = f"""Answer the question based only on the following context. If the context doesn't contain enough information to answer accurately, say so.
-
-Context:
-{" ".join(contexts)}
-
-Question: {question}
-
-Answer:"""
+    # Build the prompt with a single join rather than joining the contexts
+    # into one big string and copying it again through an f-string
+    parts = [
+        "Answer the question based only on the following context. If the context doesn't contain enough information to answer accurately, say so.\n\nContext:\n"
+    ]
+    parts.extend(contexts)
+    parts.append(f"\n\nQuestion: {question}\n\nAnswer:")
+    prompt = " ".join(parts)
 
     system_message = "You are a helpful assistant that provides accurate answers based only on the provided context. If you cannot answer based on the context, say so clearly."
 
@@ -104,19 +160,47 @@ Answer:"""
         raise
 
 
-async def rag_answer(question: str) -> Tuple[str, List[str]]:
-    """Retrieve context and generate an answer for the given question."""
+async def rag_answer(
+    question: str,
+    no_cache: bool = False,
+    num_candidates: Optional[int] = None,
+    rescore_factor: Optional[float] = None,
+) -> Tuple[str, List[str]]:
+    """Retrieve context and generate an answer for the given question.
+
+    `num_candidates` and `rescore_factor` tune retrieval recall (see
+    `retrieve_context`). Set `no_cache=True` to bypass the embedding/context
+    caches, e.g. for questions that must not be stored.
+    """
+    # Reject empty questions before any task is spawned - an empty string
+    # must never reach the embeddings API, and a batched failure there would
+    # take down every request coalesced into the same call
+    if not question.strip():
+        raise ValueError("Question cannot be empty")
+
     logger.info("Starting RAG process.")
 
     try:
-        # Check if index is empty
-        if await ESClient.is_index_empty():
+        # The emptiness check and the question embedding are independent
+        # round trips - run them in parallel so wall time is the max of the
+        # two rather than their sum
+        empty_task = asyncio.create_task(ESClient.is_index_empty())
+        embed_task = asyncio.create_task(_question_vector(question, no_cache))
+
+        if await empty_task:
+            embed_task.cancel()
             return (
                 "I apologize, but there are no documents in the knowledge base yet. Please upload some PDF documents first so I can help answer your questions.",
                 [],
             )
 
-        contexts = await retrieve_context(question)
+        contexts = await retrieve_context(
+            question,
+            num_candidates=num_candidates,
+            rescore_factor=rescore_factor,
+            no_cache=no_cache,
+            vector=await embed_task,
+        )
         answer = await generate_answer(question, contexts)
         logger.info(
             f"RAG process completed successfully - Answer length: {len(answer)}, Chunks used: {len(contexts)}"
@@ -1,10 +1,27 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
 
 class QuestionRequest(BaseModel):
     question: str = Field(..., description="The question to ask about the documents")
+    num_candidates: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description=(
+            "Number of HNSW candidates to consider per shard. Higher values "
+            "improve recall at the cost of search latency. Defaults to "
+            "max(100, 10 * top_k)."
+        ),
+    )
+    rescore_factor: Optional[float] = Field(
+        default=None,
+        ge=1.0,
+        description=(
+            "Oversampling factor for rescoring quantized vectors with full "
+            "precision. Leave unset to skip rescoring."
+        ),
+    )
 
 
 class QuestionResponse(BaseModel):
@@ -1,15 +1,179 @@
 import asyncio
+import hashlib
+import io
+import os
 import re
 import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Optional
+from tempfile import gettempdir
+from typing import List, Optional
 
 import aiofiles
+import numpy as np
 from pypdf import PdfReader
 
 from src.logging_conf import logger
 
+# Compiled once at import so normalize_text skips the per-call pattern-cache
+# probe; keep any new patterns at module scope too. The alternation fuses
+# de-hyphenation, newline collapsing and whitespace squeezing into a single
+# scan over the text. The hyphen alternative swallows the whole run of
+# "-\n" breaks plus surrounding whitespace, because removing the breaks
+# joins their neighbours into one run that the sequential passes would have
+# collapsed together.
+_RE_NORMALIZE = re.compile(r"(?:\s*-\n)+\s*|\n{2,}|[ \t]+")
+_RE_MULTI_NEWLINE = re.compile(r"\n{2,}")
+_RE_SPACES_TABS = re.compile(r"[ \t]+")
+
+
+def _normalize_repl(match: "re.Match[str]") -> str:
+    """Replacement dispatch for the fused normalization pattern."""
+    token = match.group(0)
+    if "-\n" in token:
+        # De-hyphenate, then collapse whatever run the removal joined -
+        # identical to running the sequential passes over it
+        joined = token.replace("-\n", "")
+        joined = _RE_MULTI_NEWLINE.sub("\n", joined)
+        return _RE_SPACES_TABS.sub(" ", joined)
+    if token[0] == "\n":
+        return "\n"
+    return " "
+
+
+# Upper bound on the absolute component size of a unit-normalized
+# text-embedding-3 vector. Using it as a fixed quantization scale keeps every
+# stored vector at the same magnitude, which dot_product scoring requires.
+_UNIT_MAX_COMPONENT = 0.25
+
+
+def quantize_vector(vector: List[float]) -> np.ndarray:
+    """Unit-normalize and scalar-quantize an FP32 embedding vector to int8.
+
+    Vectors are normalized to unit length and quantized with a fixed scale so
+    all stored vectors share the same magnitude. That allows the index to
+    score with `dot_product`, skipping the per-candidate magnitude math that
+    `cosine` pays, while matching the `element_type: byte` mapping.
+
+    The result stays an ndarray: the ES serializer encodes numpy natively,
+    so converting back to a 3072-element Python list would only add
+    allocation churn.
+
+    Args:
+        vector: FP32 embedding vector
+
+    Returns:
+        np.ndarray: int8 vector with components in [-128, 127]
+    """
+    arr = np.asarray(vector, dtype=np.float32)
+    arr = arr / (np.linalg.norm(arr) + 1e-12)
+    quantized = np.clip(np.round(arr * (127.0 / _UNIT_MAX_COMPONENT)), -128, 127)
+    return quantized.astype(np.int8)
+
+
+# PDF text extraction is CPU-bound, so it runs on a process pool: worker
+# interpreters don't contend with the event loop for the GIL, keeping
+# /health and /question responsive during heavy ingestion
+_extract_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """Get the shared extraction process pool, creating it on first use."""
+    global _extract_pool
+    if _extract_pool is None:
+        _extract_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _extract_pool
+
+
+# On-disk cache of extracted text keyed by PDF content hash, so re-ingesting
+# the same document skips extraction (and in the worst case OCR) entirely
+_TEXT_CACHE_DIR = Path(
+    os.getenv("TEXT_CACHE_DIR", str(Path(gettempdir()) / "rag-forge-text-cache"))
+)
+_TEXT_CACHE_MAX_FILES = 256
+
+
+async def file_sha256(path: Path | str) -> str:
+    """Hash a file's bytes without loading the whole file into memory.
+
+    Args:
+        path: Path to the file to hash
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    async with aiofiles.open(path, "rb") as f:
+        while chunk := await f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_cached_text(content_hash: str) -> Optional[str]:
+    """Return cached extracted text for a content hash, if present."""
+    try:
+        return (_TEXT_CACHE_DIR / f"{content_hash}.txt").read_text()
+    except (FileNotFoundError, OSError):
+        return None
+
+
+def cache_text(content_hash: str, text: str) -> None:
+    """Store extracted text atomically, pruning the oldest entries.
+
+    Failures are logged and swallowed - the cache is an optimization, not a
+    requirement.
+    """
+    try:
+        _TEXT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = _TEXT_CACHE_DIR / f".{content_hash}.tmp"
+        tmp_file.write_text(text)
+        tmp_file.replace(_TEXT_CACHE_DIR / f"{content_hash}.txt")
+
+        entries = sorted(_TEXT_CACHE_DIR.glob("*.txt"), key=lambda p: p.stat().st_mtime)
+        for stale in entries[: max(0, len(entries) - _TEXT_CACHE_MAX_FILES)]:
+            stale.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Failed to write text cache entry: {str(e)}")
+
+
+# Below this page count the thread-pool setup costs more than it saves
+_PARALLEL_PAGE_THRESHOLD = 4
+
+
+def _extract_page(page) -> str:
+    """Extract one page's text, mapping None to an empty string."""
+    return page.extract_text() or ""
+
+
+def _extract_text_sync(path: Path | str) -> Optional[str]:
+    """Blocking PyPDF extraction, executed in a worker process."""
+    reader = PdfReader(path)
+
+    # If the first page has no text, signal OCR fallback
+    if not reader.pages[0].extract_text():
+        return None
+
+    # Stream page text into one buffer instead of holding every page's text
+    # (plus str.join's intermediate list) in memory at once; large PDFs peak
+    # at one page of text rather than the whole document twice
+    buf = io.StringIO()
+    n_pages = len(reader.pages)
+
+    if n_pages < _PARALLEL_PAGE_THRESHOLD:
+        for i in range(n_pages):
+            buf.write(reader.pages[i].extract_text() or "")
+            buf.write("\n")
+        return buf.getvalue()
+
+    # Page decompression runs largely outside the GIL, so fanning pages out
+    # across threads is close to linear on multicore boxes; executor.map
+    # yields results in submission order, preserving page order
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+        for text in executor.map(_extract_page, reader.pages):
+            buf.write(text)
+            buf.write("\n")
+    return buf.getvalue()
+
 
 async def extract_text_from_pdf(path: Path | str) -> Optional[str]:
     """Extract text from a PDF file using PyPDF.
@@ -26,27 +190,24 @@ async def extract_text_from_pdf(path: Path | str) -> Optional[str]:
         ValueError: If the file is not a valid PDF
     """
     try:
-        # Run PDF reading in a separate thread since it's blocking I/O
-        reader = await asyncio.to_thread(PdfReader, path)
-
-        # If first page contains text, extract text from all pages in the same thread pool
-        if reader.pages[0].extract_text():
-
-            def extract_all() -> str:
-                return "\n".join(p.extract_text() for p in reader.pages)
-
-            return await asyncio.to_thread(extract_all)
-
-        # If no text found, signal OCR fallback
-        return None  # trigger OCR fallback
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_extract_pool(), _extract_text_sync, path)
     except Exception as e:
         logger.error(f"Error extracting text from PDF {path}: {str(e)}")
         raise
 
 
+# Each ocrmypdf process is itself CPU- and memory-hungry; the gate keeps a
+# burst of concurrent uploads from swamping the box with OCR work
+_OCR_SEM = asyncio.Semaphore(max(1, (os.cpu_count() or 4) // 4))
+
+
 async def run_ocrmypdf(in_path: Path | str, out_txt_path: Path | str) -> str:
     """Run OCR on a PDF file and extract text.
 
+    Concurrency is capped by a semaphore sized to CPU count // 4; each OCR
+    instance runs with --jobs 1 so it doesn't parallelize past the gate.
+
     Args:
         in_path: Path to input PDF file
         out_txt_path: Path where the extracted text will be saved
@@ -58,21 +219,26 @@ async def run_ocrmypdf(in_path: Path | str, out_txt_path: Path | str) -> str:
         subprocess.CalledProcessError: If OCR process fails
         FileNotFoundError: If input file doesn't exist or output cannot be written
     """
-    with NamedTemporaryFile(suffix=".pdf", delete=False) as temp_pdf:
+    async with aiofiles.tempfile.NamedTemporaryFile(
+        suffix=".pdf", delete=False
+    ) as temp_pdf:
         try:
-            # Run OCR process
-            process = await asyncio.create_subprocess_exec(
-                "ocrmypdf",
-                str(in_path),
-                temp_pdf.name,  # Use NamedTemporaryFile
-                "--sidecar",
-                str(out_txt_path),
-                "--quiet",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-
-            stdout, stderr = await process.communicate()
+            async with _OCR_SEM:
+                # Run OCR process
+                process = await asyncio.create_subprocess_exec(
+                    "ocrmypdf",
+                    str(in_path),
+                    str(temp_pdf.name),  # Use NamedTemporaryFile
+                    "--sidecar",
+                    str(out_txt_path),
+                    "--jobs",
+                    "1",
+                    "--quiet",
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+
+                stdout, stderr = await process.communicate()
 
             if process.returncode != 0:
                 raise subprocess.CalledProcessError(
@@ -87,9 +253,11 @@ async def run_ocrmypdf(in_path: Path | str, out_txt_path: Path | str) -> str:
             logger.error(f"Error running OCR on PDF {in_path}: {str(e)}")
             raise
         finally:
-            # Clean up temp file
+            # Clean up temp file off the event loop
             try:
-                Path(temp_pdf.name).unlink(missing_ok=True)
+                await asyncio.to_thread(os.unlink, temp_pdf.name)
+            except FileNotFoundError:
+                pass
             except Exception as e:
                 logger.warning(
                     f"Failed to cleanup temporary file {temp_pdf.name}: {str(e)}"
@@ -111,8 +279,4 @@ def normalize_text(text: str) -> str:
     if not isinstance(text, str):
         raise TypeError("Input must be a string")
 
-    text = text.replace("-\n", "")
-    text = re.sub(r"\n{2,}", "\n", text)
-    text = re.sub(r"[ \t]+", " ", text)
-
-    return text.strip()
+    return _RE_NORMALIZE.sub(_normalize_repl, text).strip()
@@ -3,13 +3,36 @@ import os
 
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 
 # Configuration
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
 
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Shared HTTP session so API calls reuse one keep-alive connection pool
+    instead of re-doing DNS and TCP setup on every rerun."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def check_api_health(url: str) -> int:
+    """Status code of the API health endpoint, cached for a few seconds.
+
+    Streamlit reruns the whole script on every widget interaction, so without
+    the cache each keystroke would hit /health again."""
+    return get_session().get(f"{url}/health", timeout=2).status_code
+
+
 def main():
     st.title("Document Q&A System")
+    session = get_session()
 
     # Sidebar for document upload
     with st.sidebar:
@@ -21,8 +44,19 @@ def main():
         if uploaded_files:
             if st.button("Process Documents"):
                 with st.spinner("Processing documents..."):
-                    files = [("files", file) for file in uploaded_files]
-                    response = requests.post(f"{API_URL}/documents", files=files)
+                    # Stream the multipart body instead of letting requests
+                    # serialize every file into one in-memory buffer first
+                    encoder = MultipartEncoder(
+                        fields=[
+                            ("files", (file.name, file, "application/pdf"))
+                            for file in uploaded_files
+                        ]
+                    )
+                    response = session.post(
+                        f"{API_URL}/documents",
+                        data=encoder,
+                        headers={"Content-Type": encoder.content_type},
+                    )
 
                     if response.status_code == 200:
                         result = response.json()
@@ -56,7 +90,7 @@ def main():
     if st.button("Get Answer", use_container_width=True):
         if question.strip():  # Only process if question is not empty
             with st.spinner("Generating answer..."):
-                response = requests.post(
+                response = session.post(
                     f"{API_URL}/question", json={"question": question}
                 )
 
@@ -76,13 +110,15 @@ def main():
     # Optional: Add a section to show system status
     with st.expander("System Status"):
         try:
-            response = requests.get(f"{API_URL}/health")  # Changed to health endpoint
-            if response.status_code == 200:
+            if check_api_health(API_URL) == 200:
                 st.success("API is running")
             else:
                 st.warning("API is running but might have issues")
         except requests.RequestException:
             st.error("API is not running")
+        if st.button("Refresh"):
+            check_api_health.clear()
+            st.rerun()
 
 
 if __name__ == "__main__":